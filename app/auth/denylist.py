@@ -0,0 +1,146 @@
+"""
+Revoked JWT ID (`jti`) denylist.
+
+Revoked IDs live in a Redis set. Each process mirrors that set into a Bloom
+filter, so the common case (a token that was never revoked) is answered with
+a few bit tests instead of a network round-trip. Filter hits are confirmed
+against Redis, which keeps the check exact.
+
+IDs revoked by another process become visible locally on the next refresh.
+The first refresh must complete before the app serves requests: an empty
+filter would let every revoked token through.
+"""
+
+import asyncio
+import hashlib
+import math
+from logging import getLogger
+from typing import Iterator, Optional, Set
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+logger = getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings; may return false positives only."""
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        # Double hashing: k positions derived from one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def might_contain(self, item: str) -> bool:
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class JtiDenylist:
+    """Bloom-filter fronted view of the Redis set of revoked token IDs."""
+
+    def __init__(
+        self,
+        redis: Optional[Redis],
+        key: str,
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+    ) -> None:
+        self._redis = redis
+        self._key = key
+        self._capacity = capacity
+        self._error_rate = error_rate
+        self._bloom = BloomFilter(capacity, error_rate)
+        # IDs added locally while a refresh is scanning Redis; SSCAN may miss
+        # them, so they are merged into the rebuilt filter before the swap
+        self._added_during_refresh: Set[str] = set()
+        self._refresh_lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._redis is not None
+
+    async def contains(self, jti: str) -> bool:
+        """
+        Check whether a token ID has been revoked.
+
+        Args:
+            jti: Token ID from the JWT payload.
+
+        Returns:
+            bool: True if the ID is in the denylist, otherwise False.
+        """
+        if self._redis is None or not self._bloom.might_contain(jti):
+            return False
+        return bool(await self._redis.sismember(self._key, jti))  # type: ignore[misc]
+
+    async def add(self, jti: str) -> None:
+        """
+        Revoke a token ID.
+
+        Args:
+            jti: Token ID to revoke.
+
+        Raises:
+            RuntimeError: If no Redis backend is configured.
+        """
+        if self._redis is None:
+            raise RuntimeError("JTI denylist requires REDIS_URL to be configured")
+        await self._redis.sadd(self._key, jti)  # type: ignore[misc]
+        self._bloom.add(jti)
+        self._added_during_refresh.add(jti)
+
+    async def refresh(self) -> None:
+        """Rebuild the local filter from the Redis set."""
+        if self._redis is None:
+            return
+        async with self._refresh_lock:
+            self._added_during_refresh = set()
+            count = await self._redis.scard(self._key)  # type: ignore[misc]
+            bloom = BloomFilter(max(self._capacity, count), self._error_rate)
+            async for jti in self._redis.sscan_iter(self._key):
+                bloom.add(jti)
+            for jti in self._added_during_refresh:
+                bloom.add(jti)
+            self._bloom = bloom
+
+    async def run_refresh(self, interval: float) -> None:
+        """
+        Refresh the filter every `interval` seconds until cancelled.
+
+        The initial refresh is expected to have been awaited at startup.
+        Later failures keep the previous filter, which already covers every
+        ID revoked up to its last successful rebuild.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Failed to refresh the JTI denylist")
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        if self._redis is not None:
+            await self._redis.aclose()
+
+
+jti_denylist = JtiDenylist(
+    Redis.from_url(settings.redis_url, decode_responses=True) if settings.redis_url else None,
+    settings.jti_denylist_key,
+)
@@ -2,20 +2,166 @@
 JWT and password utilities.
 
 Adds `iss`, `aud`, `iat`, `exp` fields to tokens, validates them on decode,
-and provides bcrypt helpers for secure password handling.
+and provides Argon2id helpers for secure password handling. Legacy bcrypt
+hashes are still accepted and flagged for rehashing.
 """
 
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TypeVar
 
 import bcrypt
 import jwt as pyjwt
+import orjson
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.types import (
+    PrivateKeyTypes,
+    PublicKeyTypes,
+)
+from jwt.api_jws import PyJWS
+from jwt.exceptions import DecodeError
+from jwt.types import Options
 from app.core.config import settings
 
+T = TypeVar("T")
+
+_BCRYPT_PREFIX = b"$2"
+
+
+class _OrjsonPyJWT(pyjwt.PyJWT):
+    """PyJWT that parses claim sets with orjson instead of the stdlib json."""
+
+    def _decode_payload(self, decoded: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            payload = orjson.loads(decoded["payload"])
+        except orjson.JSONDecodeError as e:
+            raise DecodeError(f"Invalid payload string: {e}") from e
+        if not isinstance(payload, dict):
+            raise DecodeError("Invalid payload string: must be a json object")
+        return payload
+
+
+_jws = PyJWS()
+_jwt = _OrjsonPyJWT()
+
+_DECODE_OPTIONS: Options = {"require": ["exp", "iat", "iss", "aud"]}
+
+_password_hasher = PasswordHasher(
+    time_cost=settings.argon2_time_cost,
+    memory_cost=settings.argon2_memory_cost,
+    parallelism=settings.argon2_parallelism,
+)
+
+# Dedicated pools keep bursts of logins from starving the default executor
+# shared with sync endpoints. argon2, bcrypt and cryptography release the GIL,
+# so threads already run on all cores; a process pool would only add pickling
+# and fork-safety costs. Password hashing gets its own pool so a wave of
+# Argon2 logins never queues bearer-token checks behind it.
+# Both are created on first use and dropped on shutdown, so a later lifespan
+# in the same process (tests, re-mounted apps) gets fresh pools.
+_crypto_pool: Optional[ThreadPoolExecutor] = None
+_password_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _default_password_workers() -> int:
+    # Each Argon2 call runs `parallelism` lane threads of its own, so a pool
+    # of cpu_count // parallelism keeps a login burst at about one thread
+    # per core instead of oversubscribing by the lane count
+    return max(1, (os.cpu_count() or 1) // settings.argon2_parallelism)
+
+
+def _get_crypto_pool() -> ThreadPoolExecutor:
+    global _crypto_pool
+    if _crypto_pool is None:
+        _crypto_pool = ThreadPoolExecutor(
+            max_workers=settings.crypto_pool_workers or os.cpu_count(),
+            thread_name_prefix="crypto",
+        )
+    return _crypto_pool
+
+
+def _get_password_pool() -> ThreadPoolExecutor:
+    global _password_pool
+    if _password_pool is None:
+        _password_pool = ThreadPoolExecutor(
+            max_workers=settings.password_pool_workers or _default_password_workers(),
+            thread_name_prefix="password",
+        )
+    return _password_pool
+
+
+async def run_in_crypto_pool(func: Callable[..., T], *args: Any) -> T:
+    """
+    Run a CPU-bound JWT signing or verification call on its thread pool.
+
+    Args:
+        func: Callable to execute.
+        *args: Positional arguments for the callable.
+
+    Returns:
+        T: Result of the callable.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_crypto_pool(), func, *args)
+
+
+async def _run_in_password_pool(func: Callable[..., T], *args: Any) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_password_pool(), func, *args)
+
+
+async def shutdown_crypto_pool() -> None:
+    """Stop the crypto pools, letting queued work finish off the event loop."""
+    global _crypto_pool, _password_pool
+    pools = (_crypto_pool, _password_pool)
+    _crypto_pool = _password_pool = None
+    loop = asyncio.get_running_loop()
+    for pool in pools:
+        if pool is not None:
+            await loop.run_in_executor(None, pool.shutdown)
+
+
+@lru_cache(maxsize=4)
+def _load_key(path: Path) -> str:
+    """Read a PEM key from disk once and reuse it for subsequent calls."""
+    return path.read_text()
+
+
+@lru_cache(maxsize=4)
+def _load_private_key(pem: str) -> PrivateKeyTypes:
+    """Parse a PEM private key once; PyJWT then skips parsing on every call."""
+    return serialization.load_pem_private_key(pem.encode(), password=None)
+
+
+@lru_cache(maxsize=4)
+def _load_public_key(pem: str) -> PublicKeyTypes:
+    """Parse a PEM public key once; PyJWT then skips parsing on every call."""
+    return serialization.load_pem_public_key(pem.encode())
+
+
+# The configured keys are read and parsed on first use rather than at import,
+# so processes that never touch tokens start without certs/. Afterwards the
+# token hot path gets the parsed key from a single no-argument cache hit.
+@lru_cache(maxsize=1)
+def _default_signing_key() -> PrivateKeyTypes:
+    return _load_private_key(_load_key(settings.private_key))
+
+
+@lru_cache(maxsize=1)
+def _default_verifying_key() -> PublicKeyTypes:
+    return _load_public_key(_load_key(settings.public_key))
+
 
 def encode_jwt(
     payload: Dict[str, Any],
-    private_key: str = settings.private_key.read_text(),
+    private_key: Optional[str] = None,
     algorithm: str = settings.algorithm,
     expires_in: int = settings.access_token_expires_minutes,
     expires_timedelta: Optional[timedelta] = None,
@@ -27,8 +173,8 @@ def encode_jwt(
 
     Args:
         payload: Claims to include in the token.
-        private_key: Private key for signing.
-        algorithm: Signing algorithm (RS256 by default).
+        private_key: Private key for signing (defaults to the configured key).
+        algorithm: Signing algorithm (EdDSA by default).
         expires_in: Expiration time in minutes.
         expires_timedelta: Alternative expiration delta overriding expires_in.
         issuer: Token issuer value.
@@ -37,13 +183,21 @@ def encode_jwt(
     Returns:
         str: Signed JWT string.
     """
-    now = datetime.utcnow()
-    exp = now + (expires_timedelta or timedelta(minutes=expires_in))
+    signing_key = (
+        _load_private_key(private_key) if private_key else _default_signing_key()
+    )
+    now = int(time.time())
+    if expires_timedelta is not None:
+        exp = now + int(expires_timedelta.total_seconds())
+    else:
+        exp = now + expires_in * 60
     to_encode = {**payload, "iss": issuer, "aud": audience, "exp": exp, "iat": now}
 
-    token = pyjwt.encode(
-        to_encode,
-        private_key,
+    # Serialize the claims with orjson and sign the bytes directly; this is
+    # what pyjwt.encode does internally, minus the stdlib json.dumps call.
+    token = _jws.encode(
+        orjson.dumps(to_encode),
+        signing_key,  # type: ignore[arg-type]
         algorithm=algorithm,
     )
     return token
@@ -51,7 +205,7 @@ def encode_jwt(
 
 def decode_jwt(
     token: str | bytes,
-    public_key: str = settings.public_key.read_text(),
+    public_key: Optional[str] = None,
     algorithm: str = settings.algorithm,
     issuer: str = settings.issuer,
     audience: str = settings.audience,
@@ -61,7 +215,8 @@ def decode_jwt(
 
     Args:
         token: Encoded JWT to decode.
-        public_key: Public key used for signature verification.
+        public_key: Public key used for signature verification
+            (defaults to the configured key).
         algorithm: Expected signing algorithm.
         issuer: Expected issuer.
         audience: Expected audience.
@@ -72,40 +227,80 @@ def decode_jwt(
     Raises:
         InvalidTokenError: If validation fails.
     """
-    decoded = pyjwt.decode(
+    verifying_key = (
+        _load_public_key(public_key) if public_key else _default_verifying_key()
+    )
+    decoded = _jwt.decode(
         token,
-        public_key,
+        verifying_key,  # type: ignore[arg-type]
         algorithms=[algorithm],
         audience=audience,
         issuer=issuer,
+        options=_DECODE_OPTIONS,
     )
     return decoded
 
 
-def hash_password(password: str) -> str:
+async def hash_password(password: str) -> str:
     """
-    Hash a password using bcrypt.
+    Hash a password using Argon2id.
+
+    The hashing runs on the password pool so it does not block the event loop.
 
     Args:
         password: Plain text password.
 
     Returns:
-        str: UTF-8 encoded bcrypt hash.
+        str: Encoded Argon2id hash.
     """
-    salt = bcrypt.gensalt()
-    hashed_bytes = bcrypt.hashpw(password.encode(), salt)
-    return hashed_bytes.decode("utf-8")
+    return await _run_in_password_pool(_password_hasher.hash, password)
+
+
+def _verify_password(password: str, hash_pass: str | bytes) -> bool:
+    if isinstance(hash_pass, str):
+        hash_pass = hash_pass.encode()
+    password_bytes = password.encode()
+    if hash_pass.startswith(_BCRYPT_PREFIX):
+        # bcrypt rejects malformed hashes and passwords over 72 bytes
+        try:
+            return bcrypt.checkpw(password_bytes, hash_pass)
+        except ValueError:
+            return False
+    try:
+        return _password_hasher.verify(hash_pass, password_bytes)
+    except (VerificationError, InvalidHashError):
+        return False
 
 
-def validate_password(password: str, hash_pass: str) -> bool:
+async def validate_password(password: str, hash_pass: str | bytes) -> bool:
     """
-    Validate a password against a stored bcrypt hash.
+    Validate a password against a stored Argon2id or legacy bcrypt hash.
+
+    The check runs on the password pool so it does not block the event loop.
 
     Args:
         password: Plain text password.
-        hash_pass: Stored bcrypt hash (as UTF-8 string).
+        hash_pass: Stored hash (UTF-8 string or raw bytes).
 
     Returns:
         bool: True if the password matches, otherwise False.
     """
-    return bcrypt.checkpw(password.encode(), hash_pass.encode())
+    return await _run_in_password_pool(_verify_password, password, hash_pass)
+
+
+def password_needs_rehash(hash_pass: str | bytes) -> bool:
+    """
+    Check whether a stored hash should be replaced after a successful login.
+
+    Args:
+        hash_pass: Stored hash (UTF-8 string or raw bytes).
+
+    Returns:
+        bool: True for legacy bcrypt hashes and Argon2id hashes created
+        with outdated parameters.
+    """
+    if isinstance(hash_pass, str):
+        hash_pass = hash_pass.encode()
+    if hash_pass.startswith(_BCRYPT_PREFIX):
+        return True
+    return _password_hasher.check_needs_rehash(hash_pass)
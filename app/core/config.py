@@ -1,5 +1,7 @@
 import os
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -28,13 +30,48 @@ class Settings(BaseSettings):
     # =====================================================================================================
     # Configurations for jwt
     # =====================================================================================================
+    # Ed25519 key pair, e.g.:
+    #   openssl genpkey -algorithm ed25519 -out certs/jwt-private.pem
+    #   openssl pkey -in certs/jwt-private.pem -pubout -out certs/jwt-public.pem
     private_key: Path = BASE_DIR / "certs" / "jwt-private.pem"
     public_key: Path = BASE_DIR / "certs" / "jwt-public.pem"
-    algorithm: str = "RS256"
+    algorithm: str = "EdDSA"
     access_token_expires_minutes: int = 30
     refresh_token_expires_minutes: int = 60 * 24 * 14  # 14 days by default
     issuer: str = "ai-assistant-chat"
     audience: str = "ai-assistant-clients"
+    token_cache_ttl_seconds: int = 5  # how long a verified token payload is reused
+    token_cache_maxsize: int = 10_000
+    invalid_token_cache_ttl_seconds: int = 2  # how long a rejected token is remembered
+    invalid_token_cache_maxsize: int = 2_000
+    # Auth reuses user rows for up to this long. Writes made through BaseCrud
+    # or the auth service invalidate this process's copy at once; writes from
+    # other workers, services or raw SQL can take this many seconds to affect
+    # logins and get_current_active_user.
+    user_cache_ttl_seconds: int = 5
+    user_cache_maxsize: int = 50_000
+    password_cache_ttl_seconds: int = 10  # how long a successful password check is reused
+    password_cache_maxsize: int = 1_000
+
+    # =====================================================================================================
+    # Configurations for password hashing
+    # =====================================================================================================
+    argon2_time_cost: int = Field(description="Argon2id iterations", alias="ARGON2_TIME_COST", default=2)
+    argon2_memory_cost: int = Field(
+        description="Argon2id memory in KiB", alias="ARGON2_MEMORY_COST", default=64 * 1024
+    )
+    # Lanes are hashed on separate threads, so one signup/login uses several cores
+    argon2_parallelism: int = Field(description="Argon2id lanes", alias="ARGON2_PARALLELISM", default=4)
+    crypto_pool_workers: Optional[int] = Field(
+        description="Threads for JWT signing and verification (CPU count if unset)",
+        alias="CRYPTO_POOL_WORKERS",
+        default=None,
+    )
+    password_pool_workers: Optional[int] = Field(
+        description="Threads for password hashing (CPU count // ARGON2_PARALLELISM if unset)",
+        alias="PASSWORD_POOL_WORKERS",
+        default=None,
+    )
 
     # =====================================================================================================
     # Configurations with about prject
@@ -49,6 +86,23 @@ class Settings(BaseSettings):
     cors_allow_credentials: bool = Field(description="", alias="CORS_ALLOW_CREDENTIALS", default=True)
 
     db_url: str = Field(alias="DATABASE_URL")
+    db_pool_size: int = Field(description="Persistent pool connections", alias="DB_POOL_SIZE", default=20)
+    db_max_overflow: int = Field(description="Extra connections over pool size", alias="DB_MAX_OVERFLOW", default=10)
+    db_pool_recycle: int = Field(description="Connection max age in seconds", alias="DB_POOL_RECYCLE", default=1800)
+    db_statement_cache_size: int = Field(
+        description="Prepared statements cached per asyncpg connection",
+        alias="DB_STATEMENT_CACHE_SIZE",
+        default=512,
+    )
+
+    # =====================================================================================================
+    # Configurations with redis
+    # =====================================================================================================
+    redis_url: Optional[str] = Field(description="Redis for the JTI denylist", alias="REDIS_URL", default=None)
+    jti_denylist_key: str = Field(description="Redis set of revoked JTIs", alias="JTI_DENYLIST_KEY", default="revoked_jti")
+    jti_denylist_refresh_seconds: int = Field(
+        description="Interval for syncing the local denylist filter", alias="JTI_DENYLIST_REFRESH_SECONDS", default=30
+    )
 
     # =====================================================================================================
     # Configurations with celery
@@ -56,4 +110,19 @@ class Settings(BaseSettings):
     # celery_broker_url: str = Field(description="Url for broker for celery", alias="CELERY_BROKER_URL")
     # celery_result_backend: str = Field(description="Url for backend", alias="CELERY_RESULT_BACKEND")
 
-settings = Settings()  # type: ignore
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    return Settings()  # type: ignore
+
+
+if TYPE_CHECKING:
+    settings: Settings
+
+
+def __getattr__(name: str) -> Any:
+    # Build settings on first access so importing this module (e.g. for
+    # BASE_DIR or get_settings) does not parse and validate the environment.
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,9 @@
-from typing import Generic, TypeVar, Type, Optional, List, Dict, Any, Union
+from functools import lru_cache
+from typing import Generic, TypeVar, Type, Optional, List, Dict, Any, Union, AsyncIterator, Callable
 from uuid import UUID
 
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import Select, inspect, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.base_class import BaseModel as DBBaseModel
@@ -12,11 +13,28 @@ CreateSchemas = TypeVar("CreateSchemas", bound=BaseModel)
 UpdateSchemas = TypeVar("UpdateSchemas", bound=BaseModel)
 
 
+# Callbacks run with the id of every row changed through `BaseCrud`, so caches
+# of a model's rows can be invalidated without this layer knowing about them
+_write_hooks: Dict[Type[DBBaseModel], List[Callable[[UUID], None]]] = {}
+
+
+def on_model_write(model: Type[DBBaseModel], hook: Callable[[UUID], None]) -> None:
+    """Register `hook(id)` to run after a row of `model` is updated via `BaseCrud`."""
+    _write_hooks.setdefault(model, []).append(hook)
+
+
+@lru_cache(maxsize=None)
+def _model_columns(model: Type[DBBaseModel]) -> Dict[str, Any]:
+    """Map column attribute names to their instrumented attributes, once per model."""
+    return {attr.key: getattr(model, attr.key) for attr in inspect(model).column_attrs}
+
+
 class BaseCrud(Generic[ModelType, CreateSchemas, UpdateSchemas]):
 
     def __init__(self, model: Type[ModelType], db: AsyncSession) -> None:
         self.model = model
         self.db = db
+        self._columns = _model_columns(model)
 
     async def get_by_id(
         self, id: UUID, include_deleted: bool = False
@@ -30,13 +48,11 @@ class BaseCrud(Generic[ModelType, CreateSchemas, UpdateSchemas]):
 
         return result.scalar_one_or_none()
 
-    async def get_multi_data(
+    def _multi_query(
         self,
-        skip: int = 0,
-        limit: int = 100,
         include_deleted: bool = False,
         filters: Optional[Dict[str, Any]] = None,
-    ) -> List[ModelType]:
+    ) -> Select[tuple[ModelType]]:
 
         query = select(self.model)
 
@@ -45,15 +61,51 @@ class BaseCrud(Generic[ModelType, CreateSchemas, UpdateSchemas]):
 
         if filters:
             for field, value in filters.items():
-                if hasattr(self.model, field):
-                    query = query.where(getattr(self.model, field) == value)
+                column = self._columns.get(field)
+                if column is not None:
+                    query = query.where(column == value)
 
-        query = query.offset(skip).limit(limit)
+        return query
+
+    async def get_multi_data(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        include_deleted: bool = False,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[ModelType]:
+
+        query = self._multi_query(include_deleted, filters).offset(skip).limit(limit)
 
         result = await self.db.execute(query)
 
         return list(result.scalars().all())
 
+    async def iter_multi(
+        self,
+        include_deleted: bool = False,
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[ModelType]:
+        """Stream matching rows through a server-side cursor.
+
+        Only `batch_size` rows are buffered at a time, so large exports do not
+        have to materialize the whole result set in memory. The cursor is
+        closed when the generator is; wrap it in `contextlib.aclosing` to
+        release it promptly when stopping early.
+        """
+        query = self._multi_query(include_deleted, filters).execution_options(
+            yield_per=batch_size
+        )
+
+        result = await self.db.stream_scalars(query)
+        try:
+            async for partition in result.partitions():
+                for db_obj in partition:
+                    yield db_obj
+        finally:
+            await result.close()
+
     async def create(self, obj_in: Union[CreateSchemas, Dict[str, Any]]) -> ModelType:
 
         if hasattr(obj_in, "model_dump"):
@@ -61,12 +113,12 @@ class BaseCrud(Generic[ModelType, CreateSchemas, UpdateSchemas]):
         else:
             obj_data = obj_in
 
-        db_obj = self.model(**obj_data)  # type: ignore
+        query = insert(self.model).values(**obj_data).returning(self.model)  # type: ignore[arg-type]
 
-        self.db.add(db_obj)
+        result = await self.db.execute(query)
+        db_obj = result.scalar_one()
 
         await self.db.commit()
-        await self.db.refresh(db_obj)
 
         return db_obj
 
@@ -74,20 +126,33 @@ class BaseCrud(Generic[ModelType, CreateSchemas, UpdateSchemas]):
         self, id: UUID, obj_in: Union[UpdateSchemas, Dict[str, Any]]
     ) -> Optional[ModelType]:
 
-        db_obj = await self.get_by_id(id)
-        if not db_obj:
-            return None  # TODO i need added some exceptions for return data
-
         if hasattr(obj_in, "model_dump"):
             update_data = obj_in.model_dump(exclude_unset=True)  # type: ignore[arg-type]
         else:
             update_data = obj_in
 
-        for field, value in update_data.items():  # type: ignore[union-attr]
-            if hasattr(db_obj, field):
-                setattr(db_obj, field, value)
+        values = {
+            field: value
+            for field, value in update_data.items()  # type: ignore[union-attr]
+            if field in self._columns
+        }
+        if not values:
+            return await self.get_by_id(id)
+
+        query = (
+            update(self.model)
+            .where(self.model.id == id, self.model.deleted_at.is_(None))
+            .values(**values)
+            .returning(self.model)
+        )
+
+        result = await self.db.execute(query)
+        db_obj = result.scalar_one_or_none()
+        if not db_obj:
+            return None  # TODO i need added some exceptions for return data
 
         await self.db.commit()
-        await self.db.refresh(db_obj)
+        for hook in _write_hooks.get(self.model, ()):
+            hook(id)
 
         return db_obj
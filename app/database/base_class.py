@@ -1,20 +1,56 @@
+import os
+import time
 from datetime import datetime
-from typing import Optional
-from uuid import UUID, uuid4
+from typing import Any, ClassVar, Optional
+from uuid import UUID
 
-from sqlalchemy import DateTime, func
+from sqlalchemy import DateTime, Index, func, text
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, declared_attr, mapped_column
 
 from . import Base
 
 
+def uuid7() -> UUID:
+    """
+    Generate a time-ordered UUIDv7 (RFC 9562).
+
+    The leading 48 bits hold the Unix time in milliseconds, so new primary
+    keys land on the right-most B-tree leaf instead of a random page.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76  # version
+    value |= (rand >> 68) << 64  # rand_a, 12 bits
+    value |= 0b10 << 62  # variant
+    value |= rand & 0x3FFF_FFFF_FFFF_FFFF  # rand_b, 62 bits
+    return UUID(int=value)
+
+
 class BaseModel(Base):
 
     __abstract__ = True
 
+    _repr_template: ClassVar[str] = "BaseModel(id=%r)"
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._repr_template = f"{cls.__name__}(id=%r)"
+
+    @declared_attr.directive
+    def __table_args__(cls) -> tuple[Any, ...]:
+        # Partial index over live rows backing the `deleted_at IS NULL` filters
+        return (
+            Index(
+                f"ix_{cls.__tablename__}_alive",
+                "id",
+                postgresql_where=text("deleted_at IS NULL"),
+            ),
+        )
+
     id: Mapped[UUID] = mapped_column(
-        PGUUID(as_uuid=True), primary_key=True, default=uuid4
+        PGUUID(as_uuid=True), primary_key=True, default=uuid7
     )
 
     # Timestamp fields
@@ -35,4 +71,4 @@ class BaseModel(Base):
 
 
     def __repr__(self) -> str:
-        return f"{self.__class__.__name__}(id={self.id!r})"
\ No newline at end of file
+        return self._repr_template % (self.id,)
\ No newline at end of file
@@ -4,10 +4,17 @@ Database module for the application.
 This module provides the database engine and session maker.
 
 It also provides a dependency to get a database session.
+
+The pool is sized for the auth path, which needs a connection per request
+on user-cache misses: DB_POOL_SIZE persistent connections (20 by default)
+plus DB_MAX_OVERFLOW burst connections, recycled after DB_POOL_RECYCLE
+seconds and pre-pinged so stale connections are replaced transparently.
 """
 
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict
 
+from fastapi import Depends
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -16,26 +23,62 @@ from sqlalchemy.ext.asyncio import (
 
 from app.core.config import settings
 
+
+def _connect_args() -> Dict[str, Any]:
+    """
+    Driver specific connection arguments.
+
+    asyncpg keeps a per-connection LRU of prepared statements, so repeated
+    queries skip parse and plan on the server.
+    """
+    if make_url(settings.db_url).get_driver_name() == "asyncpg":
+        return {"prepared_statement_cache_size": settings.db_statement_cache_size}
+    return {}
+
+
 async_engine = create_async_engine(
     settings.db_url,
+    connect_args=_connect_args(),
     pool_pre_ping=True,
-    echo=True,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=settings.db_pool_recycle,
+    echo=settings.debug,
 )
 
 
 AsyncSessionLocal = async_sessionmaker(
-    bind=async_engine, class_=AsyncSession, autoflush=False, autocommit=False
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    autocommit=False,
+    expire_on_commit=False,
 )
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """
+    Dependency to get the session factory.
+
+    Overriding it redirects every database access made through dependencies,
+    including sessions opened outside `get_db` such as batched auth lookups.
+
+    Returns:
+        async_sessionmaker[AsyncSession]: Factory for new sessions
+    """
+    return AsyncSessionLocal
+
+
+async def get_db(
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+) -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency to get database session.
 
     Yields:
         AsyncSession: Database session for request lifecycle
     """
-    async with AsyncSessionLocal() as session:
+    async with session_factory() as session:
         try:
             yield session
         except Exception:
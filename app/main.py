@@ -4,20 +4,26 @@ Main module for the application.
 This module provides the FastAPI application and its lifespan.
 """
 
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from logging import getLogger
 from typing import Dict
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.v1.auth import router as auth_router
+from app.auth.denylist import jti_denylist
+from app.auth.utils import shutdown_crypto_pool
 from app.core.config import settings
 from app.database.base_class import BaseModel as DBBaseModel
 from app.database.db import async_engine
 
 logger = getLogger(__name__)
 
+MIN_DB_POOL_SIZE = 10
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -32,20 +38,44 @@ async def lifespan(app: FastAPI):
         "Application startup initiated",
     )
 
-    logger.info("Application startup completed")
+    if settings.db_pool_size < MIN_DB_POOL_SIZE:
+        logger.warning(
+            "DB_POOL_SIZE=%s is below %s; concurrent auth lookups may queue for connections",
+            settings.db_pool_size,
+            MIN_DB_POOL_SIZE,
+        )
+
     async with async_engine.begin() as conn:
         await conn.run_sync(DBBaseModel.metadata.create_all)
 
+    denylist_refresh = None
+    if jti_denylist.enabled:
+        # Fail startup rather than serve with an empty filter, which would
+        # accept every revoked token
+        await jti_denylist.refresh()
+        denylist_refresh = asyncio.create_task(
+            jti_denylist.run_refresh(settings.jti_denylist_refresh_seconds)
+        )
+
+    logger.info("Application startup completed")
+
     yield
 
     # Shutdown logic
     logger.info("Application shutdown initiated")
+    if denylist_refresh is not None:
+        denylist_refresh.cancel()
+        with suppress(asyncio.CancelledError):
+            await denylist_refresh
+    await jti_denylist.close()
+    await shutdown_crypto_pool()
 
 
 main_app = FastAPI(
     title=settings.project_name,
     version=settings.version,
     description=settings.description,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,  # type: ignore[arg-type]
 )
 
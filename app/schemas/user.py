@@ -1,10 +1,15 @@
 from datetime import datetime
 from typing import Annotated, Optional
 from uuid import UUID
-import re
+import string
 
 from pydantic import BaseModel, EmailStr, Field, ConfigDict, field_validator
 
+_UPPERCASE = frozenset(string.ascii_uppercase)
+_LOWERCASE = frozenset(string.ascii_lowercase)
+_DIGITS = frozenset(string.digits)
+_SPECIAL_CHARACTERS = frozenset('!@#$%^&*(),.?":{}|<>')
+
 
 class UserBase(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -46,13 +51,13 @@ class UserCreate(UserBase):
     @field_validator("password")
     @classmethod
     def validate_password(cls, value: str) -> str:
-        if not re.search(r"[A-Z]", value):
+        if _UPPERCASE.isdisjoint(value):
             raise ValueError("password must contain at least one uppercase letter")
-        if not re.search(r"[a-z]", value):
+        if _LOWERCASE.isdisjoint(value):
             raise ValueError("password must contain at least one lowercase letter")
-        if not re.search(r"[0-9]", value):
+        if _DIGITS.isdisjoint(value):
             raise ValueError("password must contain at least one digit")
-        if not re.search(r"[!@#$%^&*(),.?\":{}|<>]", value):
+        if _SPECIAL_CHARACTERS.isdisjoint(value):
             raise ValueError("password must contain at least one special character")
         return value
 
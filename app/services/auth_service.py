@@ -4,23 +4,39 @@ for user management and JWT handling.
 """
 
 # Python imports
-from typing import Dict, Any
+import asyncio
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache, partial
+from logging import getLogger
+from typing import Awaitable, Callable, Dict, Any, Optional, Set
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from cachetools import TLRUCache, TTLCache
+
+from fastapi import BackgroundTasks, Depends, HTTPException, Request, Security, status
+from fastapi.security import HTTPBearer
 
 # JWT imports
 from jwt.exceptions import InvalidTokenError
 
 # SQLAlchemy imports
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Row, bindparam, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 # project helpers
-from app.database.db import get_db
+from app.core.config import settings
+from app.crud.base import on_model_write
+from app.database.db import get_db, get_session_factory
 from app.auth import utils as auth_utils
+from app.auth.denylist import jti_denylist
 from app.auth.utils import hash_password
 
 # import models
@@ -30,14 +46,318 @@ from app.models.user import User
 from app.schemas.access_token import AccessTokenRequest
 from app.schemas.user import UserSchemas, UserCreate, UserRead
 
-http_bearer = HTTPBearer()
+logger = getLogger(__name__)
+
+
+def _unauthorized() -> HTTPException:
+    """Build the 401 raised for every "Invalid credentials." failure.
+
+    A fresh instance per raise keeps concurrent requests from sharing
+    (and overwriting) one exception's traceback and context.
+    """
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid credentials.",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+class _BearerHeader(HTTPBearer):
+    """`HTTPBearer` for OpenAPI that hands back the raw Authorization header.
+
+    Keeps the bearer scheme (and Swagger's "Authorize" button) in the docs
+    without building `HTTPAuthorizationCredentials` on every request.
+    """
+
+    async def __call__(self, request: Request) -> Optional[str]:  # type: ignore[override]
+        return request.headers.get("authorization")
+
+
+_bearer_scheme = _BearerHeader(scheme_name="HTTPBearer", auto_error=False)
+
+
+def _forbidden_inactive() -> HTTPException:
+    """Build the 403 raised when the current user is not active."""
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="User is not active.",
+    )
+
+
+def _token_ttu(_key: bytes, payload: Dict[str, Any], now: float) -> float:
+    # Never keep a payload past the token's own expiry
+    return min(now + settings.token_cache_ttl_seconds, payload["exp"])
+
+
+# Verified token payloads and recently rejected tokens, both keyed by a
+# BLAKE2b digest of the raw token and guarded by the same lock
+_token_cache: TLRUCache[bytes, Dict[str, Any]] = TLRUCache(
+    maxsize=settings.token_cache_maxsize, ttu=_token_ttu, timer=time.time
+)
+_invalid_token_cache: TTLCache[bytes, bool] = TTLCache(
+    maxsize=settings.invalid_token_cache_maxsize,
+    ttl=settings.invalid_token_cache_ttl_seconds,
+)
+_token_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True, slots=True)
+class _UserSnapshot:
+    """Immutable copy of the user columns used by the auth flow.
+
+    Cached instead of ORM objects so entries are not tied to a session.
+    """
+
+    id: UUID
+    first_name: str
+    last_name: str
+    email: str
+    password: str
+    is_active: bool
+    access: bool
+    created_at: datetime
+    updated_at: datetime
+    deleted_at: Optional[datetime]
+
+    @classmethod
+    def from_row(cls, row: Row[Any]) -> "_UserSnapshot":
+        return cls(**row._mapping)
+
+
+# Columns loaded for snapshots; selecting them directly skips ORM hydration
+_USER_COLUMNS = (
+    User.id,
+    User.first_name,
+    User.last_name,
+    User.email,
+    User.password,
+    User.is_active,
+    User.access,
+    User.created_at,
+    User.updated_at,
+    User.deleted_at,
+)
+
+# Built once so each request reuses the statement and its compiled form
+_SELECT_USER_BY_EMAIL = (
+    select(*_USER_COLUMNS).where(User.email == bindparam("email")).limit(1)
+)
+_SELECT_USERS_BY_IDS = select(*_USER_COLUMNS).where(
+    User.id.in_(bindparam("user_ids", expanding=True))
+)
+_INSERT_USER = insert(User).returning(
+    User.id, User.created_at, User.updated_at, User.deleted_at
+)
+
+_USER_SCHEMA_FIELDS = tuple(UserSchemas.model_fields)
+
+
+# User snapshots keyed by ("email", email) and ("id", uuid)
+_user_cache: TTLCache[tuple[str, Any], _UserSnapshot] = TTLCache(
+    maxsize=settings.user_cache_maxsize, ttl=settings.user_cache_ttl_seconds
+)
+_user_cache_lock = threading.Lock()
+
+
+async def _get_user_cached(
+    key: tuple[str, Any], loader: Callable[[], Awaitable[Row[Any] | None]]
+) -> _UserSnapshot | None:
+    """Return a cached user snapshot, loading and caching it on a miss.
+
+    Missing users are not cached.
+    """
+    with _user_cache_lock:
+        snapshot = _user_cache.get(key)
+    if snapshot is not None:
+        return snapshot
+
+    row = await loader()
+    if row is None:
+        return None
+
+    snapshot = _UserSnapshot.from_row(row)
+    with _user_cache_lock:
+        _user_cache[("email", snapshot.email)] = snapshot
+        _user_cache[("id", snapshot.id)] = snapshot
+    return snapshot
+
+
+# Successful password checks keyed by HMAC(process secret, hash || password),
+# so neither the password nor a plain hash of it is kept in memory
+_password_cache_secret = secrets.token_bytes(32)
+_password_cache: TTLCache[bytes, bool] = TTLCache(
+    maxsize=settings.password_cache_maxsize, ttl=settings.password_cache_ttl_seconds
+)
+_password_cache_lock = threading.Lock()
+
+
+async def _validate_password_cached(password: str, hash_pass: str) -> bool:
+    """Verify a password, skipping the hasher for recently verified pairs.
+
+    Only successful checks are cached, and the key covers the stored hash,
+    so a changed password never matches an old entry.
+    """
+    key = hmac.new(
+        _password_cache_secret,
+        hash_pass.encode() + b"\0" + password.encode(),
+        hashlib.sha256,
+    ).digest()
+    with _password_cache_lock:
+        if key in _password_cache:
+            return True
+
+    if not await auth_utils.validate_password(password, hash_pass):
+        return False
+
+    with _password_cache_lock:
+        _password_cache[key] = True
+    return True
+
+
+class _UserLoader:
+    """Coalesce concurrent user-by-id lookups into one `WHERE id IN (...)` query.
+
+    IDs requested during the same event-loop tick are loaded together on a
+    dedicated session from `session_factory`, so a burst of requests for
+    different users costs a single round-trip instead of one per request.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        # Weak, so the factory-keyed registry below can drop unused loaders
+        self._session_factory = weakref.ref(session_factory)
+        self._pending: Dict[UUID, asyncio.Future[Row[Any] | None]] = {}
+        # The loop only keeps weak references to tasks, so hold on to them
+        self._dispatch_tasks: Set[asyncio.Task[None]] = set()
+
+    async def load(self, user_id: UUID) -> Row[Any] | None:
+        future = self._pending.get(user_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                task = loop.create_task(self._dispatch(self._pending))
+                self._dispatch_tasks.add(task)
+                task.add_done_callback(partial(self._dispatch_done, self._pending))
+            future = loop.create_future()
+            self._pending[user_id] = future
+        # Shield so one cancelled request does not cancel the shared result
+        return await asyncio.shield(future)
+
+    async def _dispatch(self, batch: Dict[UUID, asyncio.Future[Row[Any] | None]]) -> None:
+        # Yield once so the rest of this tick can enqueue its IDs
+        await asyncio.sleep(0)
+        self._close_batch(batch)
+        session_factory = self._session_factory()
+        if session_factory is None:
+            raise RuntimeError("Session factory was garbage-collected")
+        async with session_factory() as session:
+            result = await session.execute(
+                _SELECT_USERS_BY_IDS, {"user_ids": list(batch)}
+            )
+            rows = {row.id: row for row in result}
+
+        for user_id, future in batch.items():
+            if not future.done():
+                future.set_result(rows.get(user_id))
+
+    def _close_batch(self, batch: Dict[UUID, asyncio.Future[Row[Any] | None]]) -> None:
+        if self._pending is batch:
+            self._pending = {}
+
+    def _dispatch_done(
+        self,
+        batch: Dict[UUID, asyncio.Future[Row[Any] | None]],
+        task: asyncio.Task[None],
+    ) -> None:
+        # Runs even when the task is cancelled before it starts, so every
+        # waiter is released and the shielded awaits in `load` return
+        self._dispatch_tasks.discard(task)
+        self._close_batch(batch)
+        if task.cancelled():
+            for future in batch.values():
+                future.cancel()
+            return
+        exc = task.exception()
+        if exc is not None:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+                # Mark it retrieved: waiters that were cancelled never read it
+                if not future.cancelled():
+                    future.exception()
+
+
+# Keyed weakly so factories built by tests or remounted apps are not kept alive
+_user_loaders: weakref.WeakKeyDictionary[async_sessionmaker[AsyncSession], _UserLoader] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_user_loader(session_factory: async_sessionmaker[AsyncSession]) -> _UserLoader:
+    """Return the loader batching lookups for `session_factory`."""
+    loader = _user_loaders.get(session_factory)
+    if loader is None:
+        loader = _user_loaders[session_factory] = _UserLoader(session_factory)
+    return loader
+
+
+def _to_user_schema(user: _UserSnapshot) -> UserSchemas:
+    # Values come straight from the database, so skip re-validation
+    return UserSchemas.model_construct(
+        **{field: getattr(user, field) for field in _USER_SCHEMA_FIELDS}
+    )
+
+
+def _forget_user(user_id: UUID, email: Optional[str] = None) -> None:
+    """Drop cached snapshots after the user's row has changed.
+
+    Registered as a `BaseCrud` write hook, so updates made through the CRUD
+    layer (deactivation, soft delete, password change) take effect at once.
+    """
+    with _user_cache_lock:
+        snapshot = _user_cache.pop(("id", user_id), None)
+        emails = {email} if email else set()
+        if snapshot is not None:
+            emails.add(snapshot.email)
+        else:
+            # The id entry can be evicted before its email twin
+            for key in list(_user_cache.keys()):
+                cached = _user_cache.get(key) if key[0] == "email" else None
+                if cached is not None and cached.id == user_id:
+                    emails.add(key[1])
+        for cached_email in emails:
+            _user_cache.pop(("email", cached_email), None)
+
+
+on_model_write(User, _forget_user)
+
+
+@lru_cache(maxsize=4096)
+def _parse_uuid(value: str) -> UUID | None:
+    """Parse a token subject into a UUID, or None if it is not one.
+
+    Memoised because the same subjects arrive on every request of a user.
+    """
+    if len(value) != 36:
+        return None
+    try:
+        return UUID(value)
+    except ValueError:
+        return None
 
 
 async def is_jti_in_denylist(jti: str) -> bool:
     """
-    Placeholder denylist check. Replace with persistent storage lookup if needed.
+    Check the revoked-token denylist (Bloom filter first, Redis on a hit).
     """
-    return False
+    return await jti_denylist.contains(jti)
+
+
+def _user_exists_error(detail: Optional[str]) -> Dict[str, Any]:
+    return {
+        "status": "error",
+        "message": "User with this email already exists",
+        "context": {"detail": detail},
+    }
 
 
 async def create_user(db: AsyncSession, user: UserCreate) -> Dict[str, Any]:
@@ -54,69 +374,109 @@ async def create_user(db: AsyncSession, user: UserCreate) -> Dict[str, Any]:
     Raises:
         IntegrityError: When attempting to create a user with an existing username/email
     """
-    hashed_password = hash_password(user.password)
-
-    user_obj = User(
-        first_name=user.first_name,
-        last_name=user.last_name,
-        email=user.email,
-        password=hashed_password,
-        is_active=True,
-        access=True,
-    )
+    # Cheap indexed lookup first, so duplicates never pay for password hashing;
+    # the IntegrityError handler below still covers concurrent signups
+    if await _get_user_by_email(db, user.email) is not None:
+        return _user_exists_error(None)
+
+    hashed_password = await hash_password(user.password)
+
+    values = {
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "email": user.email,
+        "password": hashed_password,
+        "is_active": True,
+        "access": True,
+    }
 
-    db.add(user_obj)
     try:
+        # RETURNING hands back the generated columns, so no refresh is needed
+        result = await db.execute(_INSERT_USER, values)
+        row = result.one()
         await db.commit()
     except IntegrityError as exc:
         await db.rollback()
-        return {
-            "status": "error",
-            "message": "User with this email already exists",
-            "context": {"detail": str(exc.orig) if exc.orig else None},
-        }
-    await db.refresh(user_obj)
+        return _user_exists_error(str(exc.orig) if exc.orig else None)
+    _forget_user(row.id, user.email)
     # Do not include hashed_password in the response
-    user_read = UserRead.model_validate(user_obj)
+    user_data = {**values, **row._mapping}
+    user_read = UserRead.model_construct(
+        **{field: user_data[field] for field in _USER_SCHEMA_FIELDS}
+    )
     return {
         "status": "ok",
         "user": user_read,
     }
 
 
-async def _get_user_by_email(db: AsyncSession, email: str) -> User | None:
+async def _get_user_by_email(db: AsyncSession, email: str) -> _UserSnapshot | None:
     """Return a user by username or None if not found.
 
     Does not mutate the database. Used to eliminate code duplication.
     """
-    result = await db.execute(select(User).where(User.email == email))
-    return result.scalars().first()
+
+    async def load() -> Row[Any] | None:
+        result = await db.execute(_SELECT_USER_BY_EMAIL, {"email": email})
+        return result.one_or_none()
+
+    return await _get_user_cached(("email", email), load)
+
+
+async def _get_user_by_id(
+    user_id: UUID, session_factory: async_sessionmaker[AsyncSession]
+) -> _UserSnapshot | None:
+    """Return a user by ID or None if not found.
+
+    Cache misses are batched with concurrent lookups by the factory's
+    `_UserLoader`.
+    """
+    loader = _get_user_loader(session_factory)
+    return await _get_user_cached(("id", user_id), lambda: loader.load(user_id))
+
+
+async def _rehash_password(
+    session_factory: async_sessionmaker[AsyncSession], user: _UserSnapshot, password: str
+) -> None:
+    """Upgrade a legacy or outdated password hash after a successful login.
+
+    Runs after the response is sent. A failure only leaves the old hash in
+    place, so it is logged and the upgrade is retried on the next login.
+    """
+    try:
+        hashed_password = await hash_password(password)
+        async with session_factory() as session:
+            await session.execute(
+                update(User).where(User.id == user.id).values(password=hashed_password)
+            )
+            await session.commit()
+    except Exception:
+        logger.exception("Failed to rehash the password of user %s", user.id)
+        return
+    _forget_user(user.id, user.email)
 
 
 async def validate_auth_user(
     access_token: AccessTokenRequest,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
 ) -> UserSchemas:
     """Validate user credentials.
 
     - Find a user by username in the database
-    - Compare the password against the bcrypt hash
+    - Compare the password against the stored hash
     - Ensure the user is active
+    - Schedule an upgrade of legacy bcrypt hashes to Argon2id
 
     Returns `UserSchema` without changing endpoint external behavior.
     """
-    user: User | None = await _get_user_by_email(db, access_token.email)
+    user = await _get_user_by_email(db, access_token.email)
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid credentials.",
-        )
+        raise _unauthorized()
 
-    if not auth_utils.validate_password(access_token.password, user.password):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid credentials.",
-        )
+    if not await _validate_password_cached(access_token.password, user.password):
+        raise _unauthorized()
 
     if not user.is_active:
         raise HTTPException(
@@ -124,26 +484,55 @@ async def validate_auth_user(
             detail=f"User {user.email} has not been activated",
         )
 
-    return UserSchemas(
-        id=user.id,
-        first_name=user.first_name,
-        last_name=user.last_name,
-        email=user.email,
-        is_active=user.is_active,
-        created_at=user.created_at,
-        updated_at=user.updated_at,
-        deleted_at=user.deleted_at,
-    )
+    user_schema = _to_user_schema(user)
+
+    if auth_utils.password_needs_rehash(user.password):
+        background_tasks.add_task(
+            _rehash_password, session_factory, user, access_token.password
+        )
+
+    return user_schema
+
+
+async def _decode_jwt_cached(token: str) -> Dict[str, Any]:
+    """Decode a JWT, reusing the outcome for recently seen identical tokens.
+
+    Verified payloads are reused until the cache TTL or the token expiry.
+    Tokens that failed validation are rejected without touching the crypto
+    for a short while, so replayed garbage does not cost a verification.
+    """
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    with _token_cache_lock:
+        payload = _token_cache.get(key)
+        known_invalid = payload is None and key in _invalid_token_cache
+
+    if known_invalid:
+        raise InvalidTokenError("Token was recently rejected")
 
+    if payload is None:
+        try:
+            payload = await auth_utils.run_in_crypto_pool(auth_utils.decode_jwt, token)
+        except InvalidTokenError:
+            with _token_cache_lock:
+                _invalid_token_cache[key] = True
+            raise
+        with _token_cache_lock:
+            _token_cache[key] = payload
 
-def get_current_token_payload(
-    credentials: HTTPAuthorizationCredentials = Depends(http_bearer),
+    return dict(payload)
+
+
+async def get_current_token_payload(
+    authorization: Optional[str] = Security(_bearer_scheme),
 ) -> Dict[str, Any]:
     """
     Extract and decode a JWT token from the Authorization header.
 
+    The raw header is split here rather than parsed into
+    `HTTPAuthorizationCredentials`, which saves an object per call.
+
     Args:
-        credentials: Bearer token from the Authorization header
+        authorization: Raw Authorization header, expected as `Bearer <token>`
 
     Returns:
         dict: Decoded JWT token payload
@@ -151,20 +540,21 @@ def get_current_token_payload(
     Raises:
         AuthException: For an incorrect or invalid token
     """
+    if not authorization:
+        raise _unauthorized()
+    scheme, _, token = authorization.partition(" ")
+    if not token or scheme.lower() != "bearer":
+        raise _unauthorized()
     try:
-        token = credentials.credentials
-        payload = auth_utils.decode_jwt(token=token)
+        payload = await _decode_jwt_cached(token)
     except InvalidTokenError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid credentials.",
-        )
+        raise _unauthorized() from None
     return payload
 
 
 async def get_current_auth_user(
     payload: dict = Depends(get_current_token_payload),
-    db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
 ) -> UserSchemas:
     """Return the current user specified in payload.sub.
 
@@ -172,45 +562,21 @@ async def get_current_auth_user(
     """
     jti = payload.get("jti")
     if jti and await is_jti_in_denylist(jti):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid credentials.",
-        )
+        raise _unauthorized()
     user_id: str | None = payload.get("sub")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid credentials.",
-        )
+    if not user_id or not isinstance(user_id, str):
+        raise _unauthorized()
 
-    try:
-        user_uuid = UUID(user_id)
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid credentials.",
-        )
+    user_uuid = _parse_uuid(user_id)
+    if user_uuid is None:
+        raise _unauthorized()
 
     # Look up the user by ID
-    result = await db.execute(select(User).where(User.id == user_uuid))
-    user: User | None = result.scalars().first()
+    user = await _get_user_by_id(user_uuid, session_factory)
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid credentials.",
-        )
+        raise _unauthorized()
 
-    return UserSchemas(
-        id=user.id,
-        first_name=user.first_name,
-        last_name=user.last_name,
-        email=user.email,
-        is_active=user.is_active,
-        created_at=user.created_at,
-        updated_at=user.updated_at,
-        deleted_at=user.deleted_at,
-        access=user.access,
-    )
+    return _to_user_schema(user)
 
 
 async def get_current_active_user(
@@ -222,7 +588,4 @@ async def get_current_active_user(
     """
     if user.is_active:
         return user
-    raise HTTPException(
-        status_code=status.HTTP_403_FORBIDDEN,
-        detail="User is not active.",
-    )
+    raise _forbidden_inactive()
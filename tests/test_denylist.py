@@ -0,0 +1,121 @@
+import asyncio
+from typing import AsyncIterator, Callable, Optional, Set
+
+from app.auth.denylist import BloomFilter, JtiDenylist
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis set commands used by the denylist."""
+
+    def __init__(self, members: Optional[Set[str]] = None) -> None:
+        self.members: Set[str] = set(members or ())
+        self.on_scan: Optional[Callable[[], None]] = None
+        self.closed = False
+
+    async def sismember(self, key: str, value: str) -> bool:
+        return value in self.members
+
+    async def sadd(self, key: str, value: str) -> int:
+        self.members.add(value)
+        return 1
+
+    async def scard(self, key: str) -> int:
+        return len(self.members)
+
+    async def sscan_iter(self, key: str) -> AsyncIterator[str]:
+        snapshot = list(self.members)
+        if self.on_scan is not None:
+            self.on_scan()
+        for member in snapshot:
+            # Yield to the loop like a real network round-trip would
+            await asyncio.sleep(0)
+            yield member
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+def test_bloom_filter_has_no_false_negatives() -> None:
+    bloom = BloomFilter(capacity=1_000, error_rate=0.01)
+    items = [f"jti-{i}" for i in range(1_000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(bloom.might_contain(item) for item in items)
+
+
+def test_bloom_filter_false_positive_rate_is_bounded() -> None:
+    bloom = BloomFilter(capacity=1_000, error_rate=0.01)
+    for i in range(1_000):
+        bloom.add(f"jti-{i}")
+
+    false_positives = sum(bloom.might_contain(f"other-{i}") for i in range(10_000))
+
+    assert false_positives < 300
+
+
+def test_contains_is_false_when_disabled() -> None:
+    denylist = JtiDenylist(None, "revoked")
+
+    assert not denylist.enabled
+    assert asyncio.run(denylist.contains("jti")) is False
+
+
+def test_refresh_loads_ids_revoked_elsewhere() -> None:
+    redis = FakeRedis({"revoked-1", "revoked-2"})
+    denylist = JtiDenylist(redis, "revoked")  # type: ignore[arg-type]
+
+    async def scenario() -> None:
+        assert await denylist.contains("revoked-1") is False
+        await denylist.refresh()
+        assert await denylist.contains("revoked-1") is True
+        assert await denylist.contains("revoked-2") is True
+        assert await denylist.contains("valid") is False
+
+    asyncio.run(scenario())
+
+
+def test_contains_confirms_filter_hits_against_redis() -> None:
+    redis = FakeRedis({"revoked"})
+    denylist = JtiDenylist(redis, "revoked")  # type: ignore[arg-type]
+
+    async def scenario() -> None:
+        await denylist.refresh()
+        redis.members.clear()
+        assert await denylist.contains("revoked") is False
+
+    asyncio.run(scenario())
+
+
+def test_add_is_visible_immediately() -> None:
+    redis = FakeRedis()
+    denylist = JtiDenylist(redis, "revoked")  # type: ignore[arg-type]
+
+    async def scenario() -> None:
+        await denylist.add("revoked")
+        assert await denylist.contains("revoked") is True
+
+    asyncio.run(scenario())
+
+
+def test_refresh_keeps_ids_added_during_the_scan() -> None:
+    redis = FakeRedis({"old"})
+    denylist = JtiDenylist(redis, "revoked")  # type: ignore[arg-type]
+
+    async def scenario() -> None:
+        # The scan snapshot predates this add, as SSCAN may for late writes
+        redis.on_scan = lambda: asyncio.ensure_future(denylist.add("new"))
+        await denylist.refresh()
+        assert await denylist.contains("old") is True
+        assert await denylist.contains("new") is True
+
+    asyncio.run(scenario())
+
+
+def test_close_closes_the_redis_client() -> None:
+    redis = FakeRedis()
+    denylist = JtiDenylist(redis, "revoked")  # type: ignore[arg-type]
+
+    asyncio.run(denylist.close())
+
+    assert redis.closed
@@ -0,0 +1,143 @@
+import asyncio
+import hashlib
+from typing import Any, Dict, Iterator, List
+
+import pytest
+from cachetools import TLRUCache, TTLCache
+from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
+
+from app.auth import utils as auth_utils
+from app.core.config import settings
+from app.services import auth_service
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class FakeDecoder:
+    """`decode_jwt` stand-in that honours `exp` against the fake clock."""
+
+    def __init__(self, clock: FakeClock) -> None:
+        self.clock = clock
+        self.tokens: Dict[str, Dict[str, Any]] = {}
+        self.calls: List[str] = []
+
+    def __call__(self, token: str) -> Dict[str, Any]:
+        self.calls.append(token)
+        payload = self.tokens.get(token)
+        if payload is None:
+            raise InvalidTokenError("bad signature")
+        if payload["exp"] <= self.clock():
+            raise ExpiredSignatureError("Signature has expired")
+        return dict(payload)
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def decoder(monkeypatch: pytest.MonkeyPatch, clock: FakeClock) -> Iterator[FakeDecoder]:
+    decoder = FakeDecoder(clock)
+    monkeypatch.setattr(auth_utils, "decode_jwt", decoder)
+    monkeypatch.setattr(
+        auth_service,
+        "_token_cache",
+        TLRUCache(maxsize=100, ttu=auth_service._token_ttu, timer=clock),
+    )
+    monkeypatch.setattr(
+        auth_service,
+        "_invalid_token_cache",
+        TTLCache(maxsize=100, ttl=settings.invalid_token_cache_ttl_seconds, timer=clock),
+    )
+    yield decoder
+    asyncio.run(auth_utils.shutdown_crypto_pool())
+
+
+def _decode(token: str) -> Dict[str, Any]:
+    return asyncio.run(auth_service._decode_jwt_cached(token))
+
+
+def test_verified_payload_is_reused(decoder: FakeDecoder, clock: FakeClock) -> None:
+    decoder.tokens["good"] = {"sub": "user", "exp": clock() + 3600}
+
+    first = _decode("good")
+    first["sub"] = "changed by caller"
+    second = _decode("good")
+
+    assert second["sub"] == "user"
+    assert decoder.calls == ["good"]
+
+
+def test_payload_is_verified_again_after_the_cache_ttl(
+    decoder: FakeDecoder, clock: FakeClock
+) -> None:
+    decoder.tokens["good"] = {"sub": "user", "exp": clock() + 3600}
+
+    _decode("good")
+    clock.advance(settings.token_cache_ttl_seconds + 0.1)
+    _decode("good")
+
+    assert decoder.calls == ["good", "good"]
+
+
+def test_expired_token_is_never_served_from_cache(
+    decoder: FakeDecoder, clock: FakeClock
+) -> None:
+    # Expires well inside the cache TTL, so only the exp cap can evict it
+    lifetime = settings.token_cache_ttl_seconds / 5
+    decoder.tokens["short"] = {"sub": "user", "exp": clock() + lifetime}
+
+    _decode("short")
+    clock.advance(lifetime)
+
+    with pytest.raises(ExpiredSignatureError):
+        _decode("short")
+    assert decoder.calls == ["short", "short"]
+
+
+def test_rejected_token_is_cached_negatively(
+    decoder: FakeDecoder, clock: FakeClock
+) -> None:
+    for _ in range(3):
+        with pytest.raises(InvalidTokenError):
+            _decode("forged")
+
+    assert decoder.calls == ["forged"]
+
+
+def test_rejected_token_is_verified_again_after_the_negative_ttl(
+    decoder: FakeDecoder, clock: FakeClock
+) -> None:
+    with pytest.raises(InvalidTokenError):
+        _decode("forged")
+    clock.advance(settings.invalid_token_cache_ttl_seconds + 0.1)
+    with pytest.raises(InvalidTokenError):
+        _decode("forged")
+
+    assert decoder.calls == ["forged", "forged"]
+
+
+def test_cache_is_keyed_by_a_blake2b_digest_of_the_token(
+    decoder: FakeDecoder, clock: FakeClock
+) -> None:
+    decoder.tokens["good"] = {"sub": "user", "exp": clock() + 3600}
+
+    _decode("good")
+    with pytest.raises(InvalidTokenError):
+        _decode("forged")
+
+    def digest(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    assert list(auth_service._token_cache.keys()) == [digest("good")]
+    assert list(auth_service._invalid_token_cache.keys()) == [digest("forged")]
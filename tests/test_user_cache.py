@@ -0,0 +1,110 @@
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Iterator
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.crud.base import BaseCrud
+from app.models.user import User
+from app.services import auth_service
+
+
+def _row(user_id: UUID, email: str) -> SimpleNamespace:
+    now = datetime.now(timezone.utc)
+    return SimpleNamespace(
+        _mapping={
+            "id": user_id,
+            "first_name": "Ada",
+            "last_name": "Lovelace",
+            "email": email,
+            "password": "hash",
+            "is_active": True,
+            "access": True,
+            "created_at": now,
+            "updated_at": now,
+            "deleted_at": None,
+        }
+    )
+
+
+async def _cache_user(user_id: UUID, email: str) -> None:
+    async def load() -> Any:
+        return _row(user_id, email)
+
+    await auth_service._get_user_cached(("id", user_id), load)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache() -> Iterator[None]:
+    auth_service._user_cache.clear()
+    yield
+    auth_service._user_cache.clear()
+
+
+class FakeSession:
+    """Session stand-in for `BaseCrud.update`, returning a fixed updated row."""
+
+    def __init__(self, updated: Any) -> None:
+        self.updated = updated
+        self.commits = 0
+
+    async def execute(self, query: Any) -> Any:
+        return SimpleNamespace(scalar_one_or_none=lambda: self.updated)
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+
+def test_lookups_are_cached_under_email_and_id() -> None:
+    user_id = uuid4()
+    asyncio.run(_cache_user(user_id, "ada@example.com"))
+
+    assert ("id", user_id) in auth_service._user_cache
+    assert ("email", "ada@example.com") in auth_service._user_cache
+
+
+def test_forget_user_drops_both_entries() -> None:
+    user_id = uuid4()
+    asyncio.run(_cache_user(user_id, "ada@example.com"))
+
+    auth_service._forget_user(user_id)
+
+    assert ("id", user_id) not in auth_service._user_cache
+    assert ("email", "ada@example.com") not in auth_service._user_cache
+
+
+def test_forget_user_finds_email_entry_after_id_entry_is_gone() -> None:
+    user_id, other_id = uuid4(), uuid4()
+    asyncio.run(_cache_user(user_id, "ada@example.com"))
+    asyncio.run(_cache_user(other_id, "grace@example.com"))
+    del auth_service._user_cache[("id", user_id)]
+
+    auth_service._forget_user(user_id)
+
+    assert ("email", "ada@example.com") not in auth_service._user_cache
+    assert ("email", "grace@example.com") in auth_service._user_cache
+
+
+def test_crud_update_of_a_user_invalidates_the_cache() -> None:
+    user_id = uuid4()
+    asyncio.run(_cache_user(user_id, "ada@example.com"))
+    session = FakeSession(updated=SimpleNamespace(id=user_id))
+    crud: BaseCrud[User, Any, Any] = BaseCrud(User, session)  # type: ignore[arg-type]
+
+    asyncio.run(crud.update(user_id, {"is_active": False}))
+
+    assert session.commits == 1
+    assert ("id", user_id) not in auth_service._user_cache
+    assert ("email", "ada@example.com") not in auth_service._user_cache
+
+
+def test_crud_update_that_matches_nothing_keeps_the_cache() -> None:
+    user_id = uuid4()
+    asyncio.run(_cache_user(user_id, "ada@example.com"))
+    crud: BaseCrud[User, Any, Any] = BaseCrud(User, FakeSession(updated=None))  # type: ignore[arg-type]
+
+    asyncio.run(crud.update(user_id, {"is_active": False}))
+
+    assert ("id", user_id) in auth_service._user_cache
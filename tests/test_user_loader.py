@@ -0,0 +1,184 @@
+import asyncio
+import gc
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.services import auth_service
+from app.services.auth_service import _get_user_loader, _user_loaders, _UserLoader
+
+
+class FakeSession:
+    def __init__(self, factory: "FakeSessionFactory") -> None:
+        self._factory = factory
+
+    async def __aenter__(self) -> "FakeSession":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+    async def execute(self, statement: Any, params: Dict[str, Any]) -> List[Any]:
+        assert statement is auth_service._SELECT_USERS_BY_IDS
+        self._factory.queries.append(list(params["user_ids"]))
+        if self._factory.gate is not None:
+            await self._factory.gate.wait()
+        if self._factory.error is not None:
+            raise RuntimeError(self._factory.error)
+        return [
+            SimpleNamespace(id=user_id)
+            for user_id in params["user_ids"]
+            if user_id in self._factory.known
+        ]
+
+
+class FakeSessionFactory:
+    """Session factory stand-in that records every batched query."""
+
+    def __init__(self, known: Optional[List[UUID]] = None) -> None:
+        self.known = set(known or ())
+        self.queries: List[List[UUID]] = []
+        self.error: Optional[str] = None
+        self.gate: Optional[asyncio.Event] = None
+
+    def __call__(self) -> FakeSession:
+        return FakeSession(self)
+
+
+def _loader(factory: FakeSessionFactory) -> _UserLoader:
+    return _UserLoader(factory)  # type: ignore[arg-type]
+
+
+def test_concurrent_loads_share_one_query() -> None:
+    known = [uuid4(), uuid4(), uuid4()]
+    missing = uuid4()
+    factory = FakeSessionFactory(known)
+    loader = _loader(factory)
+
+    async def scenario() -> List[Any]:
+        ids = known + [known[0], missing]
+        return await asyncio.gather(*(loader.load(user_id) for user_id in ids))
+
+    rows = asyncio.run(scenario())
+
+    assert len(factory.queries) == 1
+    assert sorted(factory.queries[0]) == sorted(known + [missing])
+    assert [row.id for row in rows[:4]] == known + [known[0]]
+    assert rows[4] is None
+    assert not loader._dispatch_tasks
+    assert not loader._pending
+
+
+def test_loads_after_a_batch_starts_a_new_query() -> None:
+    first, second = uuid4(), uuid4()
+    factory = FakeSessionFactory([first, second])
+    loader = _loader(factory)
+
+    async def scenario() -> None:
+        assert (await loader.load(first)).id == first
+        assert (await loader.load(second)).id == second
+
+    asyncio.run(scenario())
+
+    assert factory.queries == [[first], [second]]
+
+
+def test_failure_reaches_every_waiter() -> None:
+    factory = FakeSessionFactory()
+    factory.error = "database is down"
+    loader = _loader(factory)
+
+    async def scenario() -> List[Any]:
+        loads = (loader.load(uuid4()) for _ in range(3))
+        return await asyncio.gather(*loads, return_exceptions=True)
+
+    results = asyncio.run(scenario())
+
+    assert [type(result) for result in results] == [RuntimeError] * 3
+    assert len(factory.queries) == 1
+
+
+def test_cancelling_one_waiter_keeps_the_batch_running() -> None:
+    kept, cancelled = uuid4(), uuid4()
+    factory = FakeSessionFactory([kept, cancelled])
+    factory.gate = asyncio.Event()
+    loader = _loader(factory)
+
+    async def scenario() -> Any:
+        kept_load = asyncio.ensure_future(loader.load(kept))
+        cancelled_load = asyncio.ensure_future(loader.load(cancelled))
+        while not factory.queries:
+            await asyncio.sleep(0)
+        cancelled_load.cancel()
+        factory.gate.set()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled_load
+        return await kept_load
+
+    assert asyncio.run(scenario()).id == kept
+    assert len(factory.queries) == 1
+
+
+def test_cancelling_the_batch_releases_every_waiter() -> None:
+    factory = FakeSessionFactory()
+    loader = _loader(factory)
+
+    async def scenario() -> None:
+        loads = [asyncio.ensure_future(loader.load(uuid4())) for _ in range(3)]
+        await asyncio.sleep(0)
+        (task,) = loader._dispatch_tasks
+        # Cancelled before its first step, so the coroutine body never runs
+        task.cancel()
+        done, pending = await asyncio.wait(loads, timeout=1)
+        assert not pending
+        assert all(load.cancelled() for load in done)
+        assert not loader._dispatch_tasks
+        assert not loader._pending
+
+    asyncio.run(scenario())
+
+    assert factory.queries == []
+
+
+def test_failed_batch_with_cancelled_waiter_leaves_no_unretrieved_exception() -> None:
+    factory = FakeSessionFactory()
+    factory.error = "database is down"
+    factory.gate = asyncio.Event()
+    loader = _loader(factory)
+    unhandled: List[Dict[str, Any]] = []
+
+    async def scenario() -> None:
+        asyncio.get_running_loop().set_exception_handler(
+            lambda loop, context: unhandled.append(context)
+        )
+        load = asyncio.ensure_future(loader.load(uuid4()))
+        while not factory.queries:
+            await asyncio.sleep(0)
+        load.cancel()
+        factory.gate.set()
+        while loader._dispatch_tasks:
+            await asyncio.sleep(0)
+        # The cancelled task's traceback would otherwise keep the future alive
+        del load
+        gc.collect()
+
+    asyncio.run(scenario())
+
+    assert unhandled == []
+
+
+def test_loaders_are_per_factory_and_dropped_with_it() -> None:
+    factory, other = FakeSessionFactory(), FakeSessionFactory()
+
+    loader = _get_user_loader(factory)  # type: ignore[arg-type]
+
+    assert _get_user_loader(factory) is loader  # type: ignore[arg-type]
+    assert _get_user_loader(other) is not loader  # type: ignore[arg-type]
+
+    count = len(_user_loaders)
+    del factory, loader
+    gc.collect()
+
+    assert len(_user_loaders) == count - 1